@@ -1,18 +1,57 @@
-from typing import List, TypeVar
+from typing import List, Tuple, TypeVar
 from core.semiring import Semiring
+from core._cache import cached_apsp, store_apsp
+from core._kernels import as_matrix, floyd_warshall, is_min_plus, min_plus, min_plus_power
 
 T = TypeVar("T")
 
-def extend_shortest_paths(L_prev: List[List[T]], W: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
-    L_new = [[semiring.zero for _ in range(n)] for _ in range(n)]
+def _live_columns(W: List[List[T]], n: int, zero: T) -> List[List[Tuple[int, T]]]:
+    # Column j of W as (k, W[k][j]) pairs, minus the zero entries: zero annihilates
+    # under multiply and is the identity of add, so those terms never change the sum
+    return [[(k, W[k][j]) for k in range(n) if W[k][j] != zero] for j in range(n)]
+
+def _extend_transposed(L_prev: List[List[T]], WT: List[List[Tuple[int, T]]], n: int, semiring: Semiring) -> List[List[T]]:
+    add, mul, zero = semiring.add, semiring.multiply, semiring.zero
+    L_new = [[zero for _ in range(n)] for _ in range(n)]
     for i in range(n):
+        L_prev_i, L_new_i = L_prev[i], L_new[i]
         for j in range(n):
-            for k in range(n):
-                L_new[i][j] = semiring.add(L_new[i][j], semiring.multiply(L_prev[i][k], W[k][j]))
+            acc = L_new_i[j]
+            if add is min:
+                for k, b in WT[j]:
+                    v = mul(L_prev_i[k], b)
+                    if v < acc:
+                        acc = v
+            else:
+                for k, b in WT[j]:
+                    acc = add(acc, mul(L_prev_i[k], b))
+            L_new_i[j] = acc
     return L_new
 
+def extend_shortest_paths(L_prev: List[List[T]], W: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
+    if is_min_plus(semiring):
+        return min_plus(as_matrix(L_prev), as_matrix(W)).tolist()
+    return _extend_transposed(L_prev, _live_columns(W, n, semiring.zero), n, semiring)
+
 def slow_apsp(W: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
-    L = [row[:] for row in W]
-    for r in range(1, n):
-        L = extend_shortest_paths(L, W, n, semiring)
+    # apsp_sssp computes the same W^n, so either call can reuse the other's result
+    L = cached_apsp(W, n, semiring)
+    if L is not None:
+        return [row[:] for row in L]
+
+    if is_min_plus(semiring):
+        W_np = as_matrix(W)
+        # One O(n^3) Floyd-Warshall pass when it provably equals W^n
+        D = floyd_warshall(W_np)
+        if D is None:
+            # The loop below computes W^n; square-and-multiply reaches it in O(log n) products
+            D = min_plus_power(W_np, max(n, 1))
+        L = D.tolist()
+    else:
+        # W is invariant across rounds, so transpose and prune it once here rather than per round
+        WT = _live_columns(W, n, semiring.zero)
+        L = [row[:] for row in W]
+        for r in range(1, n):
+            L = _extend_transposed(L, WT, n, semiring)
+    store_apsp(W, n, semiring, L)
     return L
@@ -1,36 +1,111 @@
+from functools import lru_cache
 from typing import List, TypeVar
 from core.semiring import Semiring
+from core._cache import cached_apsp, store_apsp
+from core._kernels import as_matrix, csgraph_distances, is_min_plus, min_plus_power, min_plus_sssp
 
 T = TypeVar("T")
 
 def extended(L_prev: List[T], W: List[List[T]], n: int, semiring: Semiring, source: int = None) -> List[T]:
+    add, mul, zero = semiring.add, semiring.multiply, semiring.zero
     if source is None:
-        L_new = [[semiring.zero for _ in range(n)] for _ in range(n)]
+        L_new = [[zero for _ in range(n)] for _ in range(n)]
         for i in range(n):
+            L_prev_i, L_new_i = L_prev[i], L_new[i]
             for j in range(n):
-                for k in range(n):
-                    L_new[i][j] = semiring.add(L_new[i][j], semiring.multiply(L_prev[i][k], W[k][j]))
+                acc = L_new_i[j]
+                if add is min:
+                    for k in range(n):
+                        v = mul(L_prev_i[k], W[k][j])
+                        if v < acc:
+                            acc = v
+                else:
+                    for k in range(n):
+                        acc = add(acc, mul(L_prev_i[k], W[k][j]))
+                L_new_i[j] = acc
         return L_new
     else:
-        d_new = [semiring.zero] * n
+        d_new = [zero] * n
         for i in range(n):
-            for j in range(n):
-                d_new[i] = semiring.add(d_new[i], semiring.multiply(W[i][j], L_prev[j]))
+            W_i, acc = W[i], d_new[i]
+            if add is min:
+                for j in range(n):
+                    v = mul(W_i[j], L_prev[j])
+                    if v < acc:
+                        acc = v
+            else:
+                for j in range(n):
+                    acc = add(acc, mul(W_i[j], L_prev[j]))
+            d_new[i] = acc
         return d_new
 
+def _sssp_step(add, j: str) -> List[str]:
+    if add is min:
+        return ["v = mul(W_i[%s], d[%s])" % (j, j), "if v < acc: acc = v"]
+    return ["acc = add(acc, mul(W_i[%s], d[%s]))" % (j, j)]
+
+@lru_cache(maxsize=32)
+def _compile_sssp(n: int, add, mul):
+    # Source text for the n-1 relaxation rounds with the loop bounds baked in as
+    # literals and the j loop unrolled by 4; keyed on the op objects themselves
+    n4 = n - n % 4
+    body = []
+    for off in range(4):
+        body += _sssp_step(add, "j + %d" % off if off else "j")
+    tail = []
+    for j in range(n4, n):
+        tail += _sssp_step(add, str(j))
+    lines = ["def f(W, d, zero):",
+             "    for _ in range(%d):" % (n - 1),
+             "        d_new = []",
+             "        for i in range(%d):" % n,
+             "            W_i, acc = W[i], zero"]
+    if n4:
+        lines.append("            for j in range(0, %d, 4):" % n4)
+        lines += ["                " + s for s in body]
+    lines += ["            " + s for s in tail]
+    lines += ["            d_new.append(acc)",
+              "        d = d_new",
+              "    return d"]
+    namespace = {"add": add, "mul": mul}
+    exec("\n".join(lines), namespace)
+    return namespace["f"]
+
 def apsp_sssp(W: List[List[T]], n: int, semiring: Semiring, *args, **kwargs) -> List[List[T]]:
     source = kwargs.get("source", None)
 
     if source is not None:
+        if is_min_plus(semiring):
+            D = cached_apsp(W, n, semiring)
+            # With a zero diagonal on W and D (no negative cycle), column `source` of
+            # W^n is exactly the n-1 round distance vector
+            if D is not None and all(W[i][i] == 0 and D[i][i] == 0 for i in range(n)):
+                return [D[i][source] for i in range(n)]
+            W_np = as_matrix(W)
+            d = csgraph_distances(W_np.T, indices=source)
+            if d is None:
+                d = min_plus_sssp(W_np, source, n - 1)
+            return d.tolist()
+
         d = [semiring.zero] * n
         d[source] = semiring.one
-
-        for _ in range(n - 1):
-            d = extended(d, W, n, semiring, source=source)
-        return d
+        return _compile_sssp(n, semiring.add, semiring.multiply)(W, d, semiring.zero)
 
     else:
-        L = [row[:] for row in W]
-        for _ in range(n - 1):
-            L = extended(L, W, n, semiring)
-        return L
\ No newline at end of file
+        L = cached_apsp(W, n, semiring)
+        if L is not None:
+            return [row[:] for row in L]
+
+        if is_min_plus(semiring):
+            W_np = as_matrix(W)
+            D = csgraph_distances(W_np)
+            if D is None:
+                # W^n in O(log n) min-plus products instead of n-1
+                D = min_plus_power(W_np, max(n, 1))
+            L = D.tolist()
+        else:
+            L = [row[:] for row in W]
+            for _ in range(n - 1):
+                L = extended(L, W, n, semiring)
+        store_apsp(W, n, semiring, L)
+        return L
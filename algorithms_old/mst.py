@@ -1,10 +1,37 @@
+import heapq
 from typing import List, Callable, TypeVar
 from core.semiring import Semiring
 
 T = TypeVar("T")
 
 
+def _prim_heap(W: List[List[T]], n: int, zero: T) -> List[List[T]]:
+    # Keyed (w, -u, -v): among equal weights the scan below keeps the last (u, v) it sees
+    mst_edges = []
+    visited = [False] * n
+    visited[0] = True
+    heap = [(w, 0, -v) for v, w in enumerate(W[0]) if w != zero]
+    heapq.heapify(heap)
+
+    while len(mst_edges) < n - 1:
+        w, nu, nv = heapq.heappop(heap)
+        v = -nv
+        if visited[v]:
+            continue
+        visited[v] = True
+        mst_edges.append((-nu, v, w))
+        W_v = W[v]
+        for x in range(n):
+            if not visited[x] and W_v[x] != zero:
+                heapq.heappush(heap, (W_v[x], -v, -x))
+
+    return mst_edges
+
+
 def mst_matrix_multiplication(W: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
+    if semiring.add is min:
+        return _prim_heap(W, n, semiring.zero)
+
     mst_edges = []
     visited = [False] * n
     visited[0] = True
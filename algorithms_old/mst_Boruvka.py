@@ -1,48 +1,57 @@
+import operator
 from typing import List, TypeVar
 from core.semiring import Semiring
+from core._kernels import as_matrix, min_plus_power
 
 T = TypeVar("T")
 
-def extend_mst(L_prev: List[List[T]], W: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
+def _extend_mst_transposed(L_prev: List[List[T]], WT: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
     L_new = [[semiring.zero for _ in range(n)] for _ in range(n)]
     for i in range(n):
+        L_prev_i, L_new_i = L_prev[i], L_new[i]
         for j in range(n):
-            for k in range(n):
-                L_new[i][j] = min(L_new[i][j], (L_prev[i][k] + W[k][j]))
+            acc = L_new_i[j]
+            for a, b in zip(L_prev_i, WT[j]):
+                v = a + b
+                if v < acc:
+                    acc = v
+            L_new_i[j] = acc
     return L_new
 
+def extend_mst(L_prev: List[List[T]], W: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
+    WT = [[W[k][j] for k in range(n)] for j in range(n)]
+    return _extend_mst_transposed(L_prev, WT, n, semiring)
+
 def slow_mst(W: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
+    # extend_mst is hard-wired to (min, +), so only the zero decides whether the kernel applies
+    if semiring.zero == float('inf'):
+        return min_plus_power(as_matrix(W), max(n, 1)).tolist()
+
+    WT = [[W[k][j] for k in range(n)] for j in range(n)]
     L = [row[:] for row in W]
     for r in range(1, n):
-        L = extend_mst(L, W, n, semiring)
+        L = _extend_mst_transposed(L, WT, n, semiring)
     return L
 
-# W = [
-#     [0, 1, 4, float('inf')],
-#     [1, 0, 2, 3],
-#     [4, 2, 0, 3],
-#     [float('inf'), 3, 3, 0]
-# ]
-
-W = [
-    [0, 2, 4, float('inf'), 3],
-    [2, 0, 3, 5, float('inf')],
-    [4, 3, 0, 5, 4],
-    [float('inf'), 5, 5, 0, 2],
-    [3, float('inf'), 4, 2, 0]
-]
-
+if __name__ == "__main__":
+    W = [
+        [0, 2, 4, float('inf'), 3],
+        [2, 0, 3, 5, float('inf')],
+        [4, 3, 0, 5, 4],
+        [float('inf'), 5, 5, 0, 2],
+        [3, float('inf'), 4, 2, 0]
+    ]
 
-n = len(W)
+    n = len(W)
 
-semiring = Semiring(
-    add=min,
-    multiply=lambda x, y: x + y,
-    zero=float('inf'),
-    one=0
-)
+    semiring = Semiring(
+        add=min,
+        multiply=operator.add,
+        zero=float('inf'),
+        one=0
+    )
 
-mst = slow_mst(W, n, semiring)
+    mst = slow_mst(W, n, semiring)
 
-for row in mst:
-    print(row)
+    for row in mst:
+        print(row)
@@ -1,5 +1,6 @@
 from typing import List, Callable, TypeVar
 from core.semiring import Semiring
+from core._kernels import as_matrix, csgraph_distances, is_min_plus, min_plus_sssp
 
 T = TypeVar("T")
 
@@ -8,15 +9,33 @@ def single_source_shortest_path(
     W: List[List[T]], source: int, n: int, semiring: Semiring
 ) -> List[T]:
 
-    d = [semiring.zero] * n
+    if is_min_plus(semiring):
+        W_np = as_matrix(W)
+        # d[i] is the distance from i to source, i.e. from source to i in the reversed graph
+        d = csgraph_distances(W_np.T, indices=source)
+        if d is None:
+            d = min_plus_sssp(W_np, source, n - 1)
+        return d.tolist()
+
+    add, mul, zero = semiring.add, semiring.multiply, semiring.zero
+    d = [zero] * n
     d[source] = semiring.one
+    # Drop zero weights once: they annihilate under multiply and never change the sum
+    live = [[(j, w) for j, w in enumerate(W[i][:n]) if w != zero] for i in range(n)]
 
     for _ in range(n - 1):
-        d_new = [semiring.zero] * n
+        d_new = [zero] * n
         for i in range(n):
-            for j in range(n):
-                d_new[i] = semiring.add(
-                    d_new[i], semiring.multiply(W[i][j], d[j]))
+            live_i, acc = live[i], d_new[i]
+            if add is min:
+                for j, w in live_i:
+                    v = mul(w, d[j])
+                    if v < acc:
+                        acc = v
+            else:
+                for j, w in live_i:
+                    acc = add(acc, mul(w, d[j]))
+            d_new[i] = acc
         d = d_new
 
     return d
@@ -0,0 +1,25 @@
+from collections import OrderedDict
+
+# W^n keyed on (id(W), id(semiring), n). Each entry holds references to W and the
+# semiring so neither id can be recycled while cached, plus a snapshot of W's
+# contents so an in-place edit is a miss rather than a stale hit.
+_MAX_ENTRIES = 8
+_apsp = OrderedDict()
+
+def _snapshot(W):
+    return tuple(tuple(row) for row in W)
+
+def cached_apsp(W, n, semiring):
+    key = (id(W), id(semiring), n)
+    entry = _apsp.get(key)
+    if entry is None or entry[2] != _snapshot(W):
+        return None
+    _apsp.move_to_end(key)
+    return entry[3]
+
+def store_apsp(W, n, semiring, L):
+    key = (id(W), id(semiring), n)
+    _apsp[key] = (W, semiring, _snapshot(W), [row[:] for row in L])
+    _apsp.move_to_end(key)
+    if len(_apsp) > _MAX_ENTRIES:
+        _apsp.popitem(last=False)
@@ -0,0 +1,164 @@
+import operator
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to the NumPy kernel
+    njit = None
+
+try:
+    from scipy.sparse.csgraph import NegativeCycleError, csgraph_from_dense, shortest_path
+except ImportError:  # scipy is optional too; callers keep their semiring loops
+    shortest_path = None
+
+# Cap on float64 cells in the broadcast temporary of one min-plus block (~32 MB)
+_MAX_TEMP_CELLS = 1 << 22
+
+# Stand-in for inf on the int32 path; two of them still add without overflowing
+_I32_INF = np.iinfo(np.int32).max // 2
+
+# fastmath minus 'nnan'/'ninf': missing edges are encoded as inf and must compare correctly
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+def as_matrix(W) -> np.ndarray:
+    # One-time conversion at the API boundary; a no-op for C-contiguous float64 input
+    return np.ascontiguousarray(W, dtype=np.float64)
+
+def is_min_plus(semiring) -> bool:
+    return (semiring.add is min and semiring.multiply in (operator.add, np.add)
+            and semiring.zero == float('inf') and semiring.one == 0)
+
+def _min_plus_numpy(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    n, p, m = A.shape[0], A.shape[1], B.shape[1]
+    C = np.empty((n, m), dtype=A.dtype)
+    rows = max(1, min(n, _MAX_TEMP_CELLS // max(1, p * m)))
+    # One (rows, p, m) scratch buffer reused by every chunk: peak memory is O(rows * n^2), not O(n^3)
+    buf = np.empty((rows, p, m), dtype=A.dtype)
+    for lo in range(0, n, rows):
+        hi = min(lo + rows, n)
+        t = buf[:hi - lo]
+        np.add(A[lo:hi, :, None], B[None, :, :], out=t)
+        np.minimum.reduce(t, axis=1, out=C[lo:hi])
+    return C
+
+# Tile edge for the compiled kernel: three 32x32 float64 tiles (24 KB) fit in a 32 KB L1
+_TILE = 32
+
+if njit is not None:
+    @njit(cache=True, fastmath=_FASTMATH, parallel=True)
+    def _min_plus_jit(A, B, C):
+        # C arrives filled with the semiring zero (inf, or _I32_INF for int32 inputs)
+        m, p = A.shape
+        q = B.shape[1]
+        for t in prange((m + _TILE - 1) // _TILE):
+            ii = t * _TILE
+            i_end = min(ii + _TILE, m)
+            for kk in range(0, p, _TILE):
+                k_end = min(kk + _TILE, p)
+                for jj in range(0, q, _TILE):
+                    j_end = min(jj + _TILE, q)
+                    # i-k-j inside the tile: B[k, jj:j_end] and C[i, jj:j_end] stream contiguously
+                    for i in range(ii, i_end):
+                        for k in range(kk, k_end):
+                            aik = A[i, k]
+                            for j in range(jj, j_end):
+                                v = aik + B[k, j]
+                                if v < C[i, j]:
+                                    C[i, j] = v
+        return C
+
+def min_plus(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    A = as_matrix(A)
+    B = as_matrix(B)
+    if njit is None:
+        return _min_plus_numpy(A, B)
+    return _min_plus_jit(A, B, np.full((A.shape[0], B.shape[1]), np.inf))
+
+def _min_plus_i32(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    if njit is None:
+        # Sums of two sentinels exceed _I32_INF; clamp so they stay "no path"
+        return np.minimum(_min_plus_numpy(A, B), _I32_INF)
+    return _min_plus_jit(A, B, np.full((A.shape[0], B.shape[1]), _I32_INF, dtype=np.int32))
+
+def _quantize_i32(W: np.ndarray, e: int):
+    # Exact only for non-negative integral weights whose e-edge walks stay below the sentinel
+    finite = np.isfinite(W)
+    w = W[finite]
+    if not np.all(W[~finite] == np.inf):
+        return None
+    if w.size and (w.min() < 0 or w.max() * e >= _I32_INF or not np.all(w == np.floor(w))):
+        return None
+    return np.where(finite, W, _I32_INF).astype(np.int32)
+
+def min_plus_power(W: np.ndarray, e: int) -> np.ndarray:
+    # W^e by square-and-multiply: ~2*log2(e) products instead of e-1, same result by associativity
+    W = as_matrix(W)
+    base = _quantize_i32(W, e)
+    if base is None:
+        base, product = W, min_plus
+    else:
+        # Integer weights: int32 halves the bytes per cell of a memory-bound kernel
+        product = _min_plus_i32
+    result = None
+    while True:
+        if e & 1:
+            result = base.copy() if result is None else product(result, base)
+        e >>= 1
+        if not e:
+            break
+        base = product(base, base)
+    if result.dtype == np.float64:
+        return result
+    return np.where(result >= _I32_INF, np.inf, result.astype(np.float64))
+
+if njit is not None:
+    @njit(cache=True, fastmath=_FASTMATH, parallel=True)
+    def _floyd_warshall_jit(D):
+        n = D.shape[0]
+        for k in range(n):
+            # Snapshot row k so the rows updated in parallel all see the pre-k values
+            row_k = D[k].copy()
+            for i in prange(n):
+                dik = D[i, k]
+                for j in range(n):
+                    v = dik + row_k[j]
+                    if v < D[i, j]:
+                        D[i, j] = v
+
+def floyd_warshall(W: np.ndarray):
+    # Same zero-diagonal / no-negative-cycle contract as csgraph_distances: returns None
+    # when the result would not equal W^n
+    D = as_matrix(W).copy()
+    if D.ndim != 2 or D.shape[0] != D.shape[1] or not np.all(np.diagonal(D) == 0):
+        return None
+    if njit is None:
+        for k in range(D.shape[0]):
+            np.minimum(D, D[:, k:k + 1] + D[k:k + 1, :], out=D)
+    else:
+        _floyd_warshall_jit(D)
+    if np.any(np.diagonal(D) < 0):
+        return None
+    return D
+
+def csgraph_distances(W: np.ndarray, indices=None):
+    # The semiring loops count walks of exactly r edges; that equals SciPy's shortest
+    # distance only with a zero diagonal and no negative cycle. Otherwise return None.
+    W = as_matrix(W)
+    if shortest_path is None or W.ndim != 2 or W.shape[0] != W.shape[1] or not np.all(np.diagonal(W) == 0):
+        return None
+    try:
+        return shortest_path(csgraph_from_dense(W, null_value=np.inf), directed=True, indices=indices)
+    except NegativeCycleError:
+        return None
+
+def min_plus_sssp(W: np.ndarray, source: int, rounds: int) -> np.ndarray:
+    W = as_matrix(W)
+    d = np.full(W.shape[0], np.inf)
+    d[source] = 0.0
+    for _ in range(rounds):
+        d_new = np.minimum.reduce(W + d[np.newaxis, :], axis=1)
+        # Bellman-Ford fixpoint: every further round would return the same vector
+        if np.array_equal(d_new, d):
+            break
+        d = d_new
+    return d
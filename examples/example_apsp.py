@@ -1,12 +1,14 @@
-from typing import List
+import operator
 from algorithms_old.apsp import slow_apsp
 from algorithms_old.apsp_sssp import apsp_sssp
 from core.semiring import Semiring
+from src.utils.matrix_utils import load_corpus_matrix
 from scipy.io import mmread
 import numpy as np
 import os
+import sys
 
-def load_mtx_as_dense_list(path: str, inf=float("inf")) -> List[List[float]]:
+def load_mtx_as_dense_list(path: str, inf=float("inf"), to_numpy: bool = False, dtype=np.float64):
     try:
         print(f"Loading matrix from {path}...")
         sparse_matrix = mmread(path)
@@ -15,22 +17,28 @@ def load_mtx_as_dense_list(path: str, inf=float("inf")) -> List[List[float]]:
         raise RuntimeError(f"Failed to read .mtx file: {e}")
 
     n = max(sparse_matrix.shape)
-    dense = [[inf] * n for _ in range(n)]
-
-    for i, j in zip(sparse_matrix.row, sparse_matrix.col):
-        dense[i][j] = 1
-        dense[j][i] = 1  # if symmetric
-
-    for i in range(n):
-        dense[i][i] = 0
+    if np.issubdtype(dtype, np.integer):
+        # Integer types have no inf; half the max keeps sentinel + sentinel from overflowing
+        inf = np.iinfo(dtype).max // 2
+    # One contiguous block filled by fancy indexing, not n*n boxed floats; float32 or
+    # int16 halve or quarter the bytes per cell for the memory-bound kernels
+    dense = np.full((n, n), inf, dtype=dtype)
+    dense[sparse_matrix.row, sparse_matrix.col] = 1
+    dense[sparse_matrix.col, sparse_matrix.row] = 1  # if symmetric
+    np.fill_diagonal(dense, 0)
     print("Loaded matrix with size:", n, "x", n)
-    return dense
+    return dense if to_numpy else dense.tolist()
+
+def print_rows(rows) -> None:
+    # One write for the whole matrix instead of a print (and stdout lock) per row
+    if rows:
+        sys.stdout.write("\n".join(map(str, rows)) + "\n")
 
 if __name__ == "__main__":
     inf = float('inf')
     shortest_path_semiring = Semiring(
         add=min,
-        multiply=lambda x, y: x + y,
+        multiply=operator.add,
         zero=inf,
         one=0
     )
@@ -43,10 +51,14 @@ if __name__ == "__main__":
     #     [2, inf, inf, 0]
     # ]
 
-    W = load_mtx_as_dense_list("A2.mtx", inf=inf)
+    # tools/prepare_corpus.py packs test_data into one archive; fall back to the .mtx text
+    corpus = os.path.join("test_data", "corpus.npz")
+    if os.path.exists(corpus):
+        W = load_corpus_matrix("A2", corpus, inf_value=inf).tolist()
+    else:
+        W = load_mtx_as_dense_list(os.path.join("test_data", "A2.mtx"), inf=inf)
     print("Input Matrix W:")
-    for row in W:
-        print(row)
+    print_rows(W)
     if not W:
         raise ValueError("The input matrix W is empty or not loaded correctly.")
 
@@ -54,11 +66,9 @@ if __name__ == "__main__":
     shortest_paths = apsp_sssp(W, n, shortest_path_semiring)
 
     print("All-Pairs Shortest Path Matrix from generlised with A2:")
-    for row in shortest_paths:
-        print(row)
+    print_rows(shortest_paths)
 
     shortest_path = slow_apsp(W, n, shortest_path_semiring)
 
     print("\nAll-Pairs Shortest Path Matrix from Normal:")
-    for row in shortest_path:
-        print(row)
+    print_rows(shortest_path)
@@ -1,3 +1,4 @@
+import operator
 from algorithms_old.mst import mst_matrix_multiplication
 from core.semiring import Semiring
 
@@ -6,7 +7,8 @@ if __name__ == "__main__":
     
     mst_semiring = Semiring(
         add=min,
-        multiply=lambda x, y: x + y if x != inf and y != inf else inf,
+        # IEEE floats already give x + inf == inf; weights are never -inf
+        multiply=operator.add,
         zero=inf,
         one=0
     )
@@ -23,5 +25,4 @@ if __name__ == "__main__":
     mst_edges = mst_matrix_multiplication(W, n, mst_semiring)
 
     print("Edges in the Minimum Spanning Tree:")
-    for u, v, weight in mst_edges:
-        print(f"({u}, {v}) with weight {weight}")
+    print("\n".join(f"({u}, {v}) with weight {weight}" for u, v, weight in mst_edges))
@@ -1,3 +1,4 @@
+import operator
 from algorithms_old.mst_Boruvka import slow_mst
 from core.semiring import Semiring
 
@@ -6,7 +7,8 @@ if __name__ == "__main__":
 
     mst_semiring = Semiring(
         add=min,
-        multiply=lambda x, y: x + y if x != inf and y != inf else inf,
+        # IEEE floats already give x + inf == inf; weights are never -inf
+        multiply=operator.add,
         zero=inf,
         one=0
     )
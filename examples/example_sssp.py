@@ -2,18 +2,18 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.algorithms.generalized import apsp_sssp
-from src.core.semiring import Semiring
+from src.algorithms.generalized import apsp_sssp, apsp_sssp_fast
+from src.core.semiring import SHORTEST_PATH_SEMIRING
 
 if __name__ == "__main__":
     inf = float('inf')
 
-    shortest_path_semiring = Semiring(
-        add=min,
-        multiply=lambda x, y: x + y if x != inf and y != inf else inf,
-        zero=inf,
-        one=0
-    )
+    # The module-level instance has stable (min, operator.add) ops, so apsp_sssp
+    # dispatches it to the vectorized kernel instead of the Python loops
+    shortest_path_semiring = SHORTEST_PATH_SEMIRING
+    # Bound once for apsp_sssp_fast, which takes the operations as plain arguments
+    add_op, mul_op = shortest_path_semiring.add, shortest_path_semiring.multiply
+    zero, one = shortest_path_semiring.zero, shortest_path_semiring.one
 
     W = [
         [0, 3, inf, inf],
@@ -32,7 +32,7 @@ if __name__ == "__main__":
     print(f"Shortest distances from vertex {source_vertex}:")
     print(distances)
 
-    distances = apsp_sssp(W, n, shortest_path_semiring, source=source_vertex)
+    distances = apsp_sssp_fast(W, n, add_op, mul_op, zero, one, source=source_vertex)
 
     print(f"\nShortest distances from vertex {source_vertex} using generalized:")
     print(distances)
\ No newline at end of file
@@ -8,11 +8,13 @@ from .core.semiring import (
     LONGEST_PATH_SEMIRING,
     WIDEST_PATH_SEMIRING,
     REACHABILITY_SEMIRING,
-    PATH_COUNT_SEMIRING
+    PATH_COUNT_SEMIRING,
+    make_shortest_path_semiring
 )
 
 from .algorithms.generalized import (
     apsp_sssp,
+    apsp_sssp_fast,
     slow_apsp,
     extended,
     extend_shortest_paths,
@@ -30,11 +32,17 @@ from .algorithms.traditional import (
 
 from .utils.matrix_utils import (
     load_mtx_as_dense_list,
+    load_mtx_as_ndarray,
+    load_mtx_as_csr,
     generate_random_mtx_file,
+    generate_random_dense,
+    load_or_generate,
+    load_corpus_matrix,
+    allclose_with_inf,
     find_mtx_files
 )
 
-from .utils.testing_framework import AlgorithmTester
+from .utils.testing_framework import AlgorithmTester, time_algorithm, worker_pool
 
 __version__ = "1.0.0"
 __author__ = "Research Team"
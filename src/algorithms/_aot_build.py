@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time compile the semiring product into src/algorithms/_aot_kernels.
+
+Run once per machine (needs numba and a C compiler):
+
+    python src/algorithms/_aot_build.py
+
+The resulting extension module is native code, so _numba_kernels can use it
+even where numba is not installed, and its first call pays no JIT
+compilation. AOT builds cannot use parallel=True, so when numba is available
+the parallel JIT kernel is still preferred.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from numba.pycc import CC
+
+from src.algorithms._numba_kernels import semiring_matmul_kernel
+
+cc = CC("_aot_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export("semiring_matmul", "f8[:,:](f8[:,:], f8[:,:], f8, i8)")(semiring_matmul_kernel)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built {cc.output_file} in {cc.output_dir}")
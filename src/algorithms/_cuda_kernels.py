@@ -0,0 +1,109 @@
+"""
+CUDA kernels for the dense semiring power behind APSP.
+
+numba.cuda is optional: without it, or without a usable GPU,
+``semiring_power_cuda`` returns ``None`` and callers stay on the CPU kernels.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from src.algorithms._numba_kernels import MAX_MIN, MAX_PLUS, MIN_PLUS
+
+try:
+    from numba import cuda, float64
+except ImportError:  # numba is optional
+    cuda = None
+
+# Below this size host/device transfers and launch overhead outweigh the GPU
+CUDA_MIN_N = 1024
+
+# Edge of the square shared-memory tiles and of each thread block (32 x 32 = 1024 threads)
+TPB = 32
+
+
+@lru_cache(maxsize=None)
+def _cuda_available() -> bool:
+    # Probing the driver is slow, so it happens once per process
+    try:
+        return cuda.is_available()
+    except Exception:
+        return False
+
+
+if cuda is not None:
+    @cuda.jit
+    def _semiring_matmul_cuda(A, B, C, zero, op):
+        """
+        One thread per C[i, j]; each block stages TPB x TPB tiles of A and B
+        in shared memory, so every loaded cell is reused TPB times.
+        """
+        sA = cuda.shared.array(shape=(TPB, TPB), dtype=float64)
+        sB = cuda.shared.array(shape=(TPB, TPB), dtype=float64)
+        tx = cuda.threadIdx.x
+        ty = cuda.threadIdx.y
+        i = cuda.blockIdx.y * TPB + ty
+        j = cuda.blockIdx.x * TPB + tx
+        m, p = A.shape
+        q = B.shape[1]
+
+        acc = zero
+        for t in range((p + TPB - 1) // TPB):
+            k0 = t * TPB
+            if i < m and k0 + tx < p:
+                sA[ty, tx] = A[i, k0 + tx]
+            if j < q and k0 + ty < p:
+                sB[ty, tx] = B[k0 + ty, j]
+            cuda.syncthreads()
+            # Only the first kmax tile cells hold data; padding is never read
+            kmax = min(TPB, p - k0)
+            if i < m and j < q:
+                for k in range(kmax):
+                    if op == MIN_PLUS:
+                        v = sA[ty, k] + sB[k, tx]
+                        if v < acc:
+                            acc = v
+                    elif op == MAX_PLUS:
+                        v = sA[ty, k] + sB[k, tx]
+                        if v > acc:
+                            acc = v
+                    else:
+                        v = min(sA[ty, k], sB[k, tx])
+                        if v > acc:
+                            acc = v
+            cuda.syncthreads()
+
+        if i < m and j < q:
+            C[i, j] = acc
+
+
+def semiring_power_cuda(W: np.ndarray, e: int, zero, op: int):
+    """
+    W^e by repeated squaring on the GPU, or None when no GPU can run it.
+
+    W is copied to the device once and every product stays resident there;
+    only W^e is copied back. min and max are exact in any order, so the result
+    equals the CPU kernels' bit for bit. Only float64 input is handled.
+    """
+    if cuda is None or W.dtype != np.float64 or op not in (MIN_PLUS, MAX_PLUS, MAX_MIN) or not _cuda_available():
+        return None
+    n = W.shape[0]
+    blocks = (math.ceil(n / TPB), math.ceil(n / TPB))
+    threads = (TPB, TPB)
+
+    def product(A, B):
+        C = cuda.device_array((n, n), dtype=np.float64)
+        _semiring_matmul_cuda[blocks, threads](A, B, C, float(zero), op)
+        return C
+
+    base = cuda.to_device(np.ascontiguousarray(W))
+    result = None
+    while True:
+        if e & 1:
+            result = base if result is None else product(result, base)
+        e >>= 1
+        if not e:
+            return result.copy_to_host()
+        base = product(base, base)
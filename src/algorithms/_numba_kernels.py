@@ -0,0 +1,215 @@
+"""
+Numba-compiled kernels backing the traditional algorithms.
+
+numba is optional: when it is not installed ``njit`` is ``None`` and callers
+fall back to their NumPy implementations, except for the semiring product,
+which uses the _aot_build.py module when one has been compiled.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional
+    njit = None
+
+# fastmath without 'nnan'/'ninf': a missing edge is inf and must compare correctly
+FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+# Tile edge for semiring_matmul_numba: a 64x64 float64 tile of B (32 KB) stays in L1/L2
+TILE = 64
+
+# Semiring selectors for semiring_matmul_numba
+MIN_PLUS, MAX_PLUS, MAX_MIN = 0, 1, 2
+
+try:
+    # Ahead-of-time build from _aot_build.py: a native product with no numba at runtime
+    from src.algorithms._aot_kernels import semiring_matmul as _aot_semiring_matmul
+except ImportError:
+    _aot_semiring_matmul = None
+
+
+def semiring_matmul_kernel(A, B, zero, op):
+    """
+    Tiled semiring product C[i, j] = add(zero, add_k mul(A[i, k], B[k, j])).
+    
+    ``op`` selects the semiring (MIN_PLUS, MAX_PLUS or MAX_MIN); the branch
+    sits outside the innermost loop, so each variant compiles to its own
+    tight j loop. Row tiles run in parallel; inside a tile the i-k-j order
+    streams rows of B and C, so no n^3 temporary is materialized.
+    """
+    m, p = A.shape
+    q = B.shape[1]
+    # Same dtype as A: float32 inputs compile their own float32 specialization
+    C = np.full((m, q), zero, A.dtype)
+    # prange is numba's parallel range; _aot_build compiles this body serially
+    for t in prange((m + TILE - 1) // TILE):
+        i0 = t * TILE
+        i1 = min(i0 + TILE, m)
+        for k0 in range(0, p, TILE):
+            k1 = min(k0 + TILE, p)
+            for j0 in range(0, q, TILE):
+                j1 = min(j0 + TILE, q)
+                for i in range(i0, i1):
+                    for k in range(k0, k1):
+                        aik = A[i, k]
+                        if op == MIN_PLUS:
+                            for j in range(j0, j1):
+                                v = aik + B[k, j]
+                                if v < C[i, j]:
+                                    C[i, j] = v
+                        elif op == MAX_PLUS:
+                            for j in range(j0, j1):
+                                v = aik + B[k, j]
+                                if v > C[i, j]:
+                                    C[i, j] = v
+                        else:
+                            for j in range(j0, j1):
+                                v = min(aik, B[k, j])
+                                if v > C[i, j]:
+                                    C[i, j] = v
+    return C
+
+
+def _semiring_matmul_aot(A, B, zero, op):
+    """
+    semiring_matmul_kernel through the AOT module, which is built for float64 only.
+    
+    float32 inputs are widened and the result narrowed back; a float64 sum of two
+    float32 values rounds to the same float32 as a float32 add, so this matches
+    the JIT's float32 specialization exactly.
+    """
+    C = _aot_semiring_matmul(np.ascontiguousarray(A, dtype=np.float64),
+                             np.ascontiguousarray(B, dtype=np.float64), float(zero), op)
+    return C.astype(A.dtype, copy=False)
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=FASTMATH, parallel=True)
+    def fw_numba(dist):
+        """
+        In-place Floyd-Warshall on a float64 distance matrix.
+        
+        k stays sequential; the rows of each k step run in parallel. With a
+        zero diagonal and non-negative weights step k never changes row or
+        column k, so the rows read no cell another thread writes.
+        """
+        n = dist.shape[0]
+        for k in range(n):
+            for i in prange(n):
+                dik = dist[i, k]
+                if dik == np.inf:
+                    continue
+                for j in range(n):
+                    v = dik + dist[k, j]
+                    if v < dist[i, j]:
+                        dist[i, j] = v
+
+    @njit(cache=True, fastmath=FASTMATH, parallel=True)
+    def fw_symmetric_numba(dist):
+        """
+        In-place Floyd-Warshall for a symmetric distance matrix.
+        
+        Floyd-Warshall preserves symmetry, so only j >= i is relaxed and each
+        improvement is mirrored: half the adds and compares of fw_numba. Rows
+        run in parallel as in fw_numba; the pair (i, j) is only ever written by
+        the thread owning row min(i, j).
+        """
+        n = dist.shape[0]
+        for k in range(n):
+            for i in prange(n):
+                dik = dist[i, k]
+                if dik == np.inf:
+                    continue
+                for j in range(i + 1, n):
+                    v = dik + dist[k, j]
+                    if v < dist[i, j]:
+                        dist[i, j] = v
+                        dist[j, i] = v
+
+    @njit(cache=True, fastmath=FASTMATH, parallel=True)
+    def fw_blocked_numba(dist, tile):
+        """
+        In-place three-phase blocked Floyd-Warshall, ``tile`` x ``tile`` blocks.
+        
+        For each pivot block: (1) plain Floyd-Warshall inside the diagonal
+        block, (2) the other blocks of its row and column against it, (3) every
+        remaining block from its row and column blocks. Each phase writes
+        disjoint blocks, so phases 2 and 3 run blocks in parallel, and each
+        block update works on three tiles that stay in cache.
+        """
+        n = dist.shape[0]
+        nb = (n + tile - 1) // tile
+        for b in range(nb):
+            k0 = b * tile
+            k1 = min(k0 + tile, n)
+            for k in range(k0, k1):
+                for i in range(k0, k1):
+                    dik = dist[i, k]
+                    for j in range(k0, k1):
+                        v = dik + dist[k, j]
+                        if v < dist[i, j]:
+                            dist[i, j] = v
+            # Even t: block (b, t // 2) of the pivot row; odd t: block (t // 2, b) of the pivot column
+            for t in prange(2 * nb):
+                o = t // 2
+                if o == b:
+                    continue
+                o0 = o * tile
+                o1 = min(o0 + tile, n)
+                if t % 2 == 0:
+                    i0, i1, j0, j1 = k0, k1, o0, o1
+                else:
+                    i0, i1, j0, j1 = o0, o1, k0, k1
+                for k in range(k0, k1):
+                    for i in range(i0, i1):
+                        dik = dist[i, k]
+                        if dik == np.inf:
+                            continue
+                        for j in range(j0, j1):
+                            v = dik + dist[k, j]
+                            if v < dist[i, j]:
+                                dist[i, j] = v
+            for ib in prange(nb):
+                if ib == b:
+                    continue
+                i0 = ib * tile
+                i1 = min(i0 + tile, n)
+                for jb in range(nb):
+                    if jb == b:
+                        continue
+                    j0 = jb * tile
+                    j1 = min(j0 + tile, n)
+                    for i in range(i0, i1):
+                        for k in range(k0, k1):
+                            dik = dist[i, k]
+                            if dik == np.inf:
+                                continue
+                            for j in range(j0, j1):
+                                v = dik + dist[k, j]
+                                if v < dist[i, j]:
+                                    dist[i, j] = v
+
+    @njit(cache=True, fastmath=FASTMATH)
+    def bf_numba(n, us, vs, source):
+        """Unit-weight Bellman-Ford over the edge list ``(us[e], vs[e])``."""
+        distances = np.full(n, np.inf)
+        distances[source] = 0.0
+        for _ in range(n - 1):
+            changed = False
+            for e in range(us.shape[0]):
+                du = distances[us[e]] + 1.0
+                if du < distances[vs[e]]:
+                    distances[vs[e]] = du
+                    changed = True
+            if not changed:
+                break
+        return distances
+
+    semiring_matmul_numba = njit(cache=True, fastmath=FASTMATH, parallel=True)(semiring_matmul_kernel)
+else:
+    fw_numba = None
+    fw_symmetric_numba = None
+    fw_blocked_numba = None
+    bf_numba = None
+    semiring_matmul_numba = _semiring_matmul_aot if _aot_semiring_matmul is not None else None
@@ -5,11 +5,125 @@ This module implements generalized versions of common graph algorithms
 that work with any semiring structure.
 """
 
+import heapq
+import math
+import operator
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, TypeVar
-from src.core.semiring import Semiring
+
+import numpy as np
+
+from src.algorithms._cuda_kernels import CUDA_MIN_N, semiring_power_cuda
+from src.algorithms._numba_kernels import MAX_MIN, MAX_PLUS, MIN_PLUS, semiring_matmul_numba
+from src.core.semiring import Semiring, _compile_extend
 
 T = TypeVar("T")
 
+# (add, multiply) -> NumPy ufunc pair for semirings whose ops map onto ufuncs exactly.
+# Anything not listed here runs the generic Python loops.
+SEMIRING_KERNELS = {
+    (min, operator.add): (np.minimum, np.add),
+    (max, operator.add): (np.maximum, np.add),
+    (max, min): (np.maximum, np.minimum),
+}
+
+# ufunc pair -> selector of the compiled product in _numba_kernels
+_NUMBA_OPS = {
+    (np.minimum, np.add): MIN_PLUS,
+    (np.maximum, np.add): MAX_PLUS,
+    (np.maximum, np.minimum): MAX_MIN,
+}
+
+# Cap on float64 cells in the broadcast temporaries of one product, over all threads (~32 MB)
+_MAX_TEMP_CELLS = 1 << 22
+
+# Threads sharing the row blocks of the NumPy product; ufuncs release the GIL
+_WORKERS = os.cpu_count() or 1
+
+
+def _semiring_kernel(semiring: Semiring):
+    """Return the ufunc pair for ``semiring``, or None if it has no vectorized kernel."""
+    return SEMIRING_KERNELS.get((semiring.add, semiring.multiply))
+
+
+def _as_array(W, n: int) -> np.ndarray:
+    """
+    Convert the leading n x n block of ``W`` to a float array.
+    
+    float32 arrays (e.g. from ``load_mtx_as_ndarray(..., dtype=np.float32)``)
+    keep their dtype so the memory-bound products move half the bytes;
+    everything else becomes float64.
+    """
+    dtype = np.float32 if getattr(W, "dtype", None) == np.float32 else np.float64
+    return np.asarray(W, dtype=dtype).reshape(len(W), len(W[0]) if len(W) else 0)[:n, :n]
+
+
+def _semiring_matmul(A: np.ndarray, B: np.ndarray, kernel, zero) -> np.ndarray:
+    """
+    Semiring matrix product C[i][j] = add_k mul(A[i][k], B[k][j]) with ufuncs.
+    
+    Rows are processed in blocks so the broadcast temporary stays bounded, and
+    ``zero`` seeds every reduction exactly like the accumulator of the Python loop.
+    """
+    if semiring_matmul_numba is not None:
+        # Compiled, cache-tiled kernel: no broadcast temporary at all
+        dtype = np.result_type(A, B)
+        return semiring_matmul_numba(np.ascontiguousarray(A, dtype=dtype), np.ascontiguousarray(B, dtype=dtype),
+                                     float(zero), _NUMBA_OPS[kernel])
+    add, mul = kernel
+    n, p, m = A.shape[0], A.shape[1], B.shape[1]
+    C = np.empty((n, m), dtype=np.result_type(A, B))
+    rows = max(1, _MAX_TEMP_CELLS // (_WORKERS * max(1, p * m)))
+
+    def block(lo):
+        hi = min(lo + rows, n)
+        add.reduce(mul(A[lo:hi, :, None], B[None, :, :]), axis=1, initial=zero, out=C[lo:hi])
+
+    starts = range(0, n, rows)
+    if len(starts) == 1 or _WORKERS == 1:
+        for lo in starts:
+            block(lo)
+    else:
+        # Blocks write disjoint rows of C, so they need no locking
+        with ThreadPoolExecutor(max_workers=_WORKERS) as pool:
+            list(pool.map(block, starts))
+    return C
+
+
+def _semiring_power(W: np.ndarray, e: int, kernel, zero) -> np.ndarray:
+    """
+    W^e by repeated squaring: about 2*log2(e) products instead of e - 1.
+    
+    The linear loops compute W^n, and by associativity so does this; no
+    idempotence is needed because it is the same power, not a closure.
+    """
+    if W.shape[0] >= CUDA_MIN_N:
+        # Large dense powers go to the GPU when one is usable; None means stay on the CPU
+        result = semiring_power_cuda(W, e, zero, _NUMBA_OPS[kernel])
+        if result is not None:
+            return result
+    result = None
+    base = W
+    while True:
+        if e & 1:
+            result = base.copy() if result is None else _semiring_matmul(result, base, kernel, zero)
+        e >>= 1
+        if not e:
+            return result
+        base = _semiring_matmul(base, base, kernel, zero)
+
+
+def _semiring_matvec(W: np.ndarray, d: np.ndarray, kernel, zero, out=None, scratch=None) -> np.ndarray:
+    """
+    Semiring matrix-vector product d_new[i] = add_j mul(W[i][j], d[j]).
+    
+    ``out`` (length n) and ``scratch`` (shape of W) are optional preallocated
+    buffers, so a caller iterating the product allocates nothing per round.
+    """
+    add, mul = kernel
+    return add.reduce(mul(W, d[None, :], out=scratch), axis=1, initial=zero, out=out)
+
 
 def extended(L_prev: List[T], W: List[List[T]], n: int, semiring: Semiring, source: int = None) -> List[T]:
     """
@@ -25,20 +139,29 @@ def extended(L_prev: List[T], W: List[List[T]], n: int, semiring: Semiring, sour
     Returns:
         Updated matrix/vector
     """
+    kernel = _semiring_kernel(semiring)
+    if kernel is not None:
+        if source is None:
+            return _semiring_matmul(_as_array(L_prev, n), _as_array(W, n), kernel, semiring.zero).tolist()
+        d = np.asarray(L_prev[:n], dtype=np.float64)
+        return _semiring_matvec(_as_array(W, n), d, kernel, semiring.zero).tolist()
+
+    return _extend_generic(L_prev, W, n, semiring.add, semiring.multiply, semiring.zero, source)
+
+
+def _extend_generic(L_prev, W, n: int, add, mul, zero, source: int = None):
+    """Python-loop body of ``extended``; the operations arrive as bare locals."""
     if source is None:
-        # All-pairs case
-        L_new = [[semiring.zero for _ in range(n)] for _ in range(n)]
-        for i in range(n):
-            for j in range(n):
-                for k in range(n):
-                    L_new[i][j] = semiring.add(L_new[i][j], semiring.multiply(L_prev[i][k], W[k][j]))
-        return L_new
+        # All-pairs case: i-k-j loop generated with the operations inlined
+        return _compile_extend(add, mul)(L_prev, W, n, zero)
     else:
         # Single-source case
-        d_new = [semiring.zero] * n
+        d_new = [zero] * n
         for i in range(n):
+            W_i, acc = W[i], d_new[i]
             for j in range(n):
-                d_new[i] = semiring.add(d_new[i], semiring.multiply(W[i][j], L_prev[j]))
+                acc = add(acc, mul(W_i[j], L_prev[j]))
+            d_new[i] = acc
         return d_new
 
 
@@ -55,19 +178,47 @@ def apsp_sssp(W: List[List[T]], n: int, semiring: Semiring, source: int = None)
     Returns:
         Distance matrix (APSP) or distance vector wrapped in list (SSSP)
     """
+    return apsp_sssp_fast(W, n, semiring.add, semiring.multiply, semiring.zero, semiring.one, source)
+
+
+def apsp_sssp_fast(W: List[List[T]], n: int, add, multiply, zero, one, source: int = None) -> List[List[T]]:
+    """
+    apsp_sssp with the semiring given as bare operations and identities.
+    
+    apsp_sssp itself unpacks its Semiring once and calls this, so callers
+    that already hold the operations as locals need no Semiring at all;
+    results are identical.
+    """
+    kernel = SEMIRING_KERNELS.get((add, multiply))
+    if kernel is not None:
+        # Convert once and keep every round in NumPy
+        W_np = _as_array(W, n)
+        if source is not None:
+            d = np.full(n, zero, dtype=W_np.dtype)
+            d[source] = one
+            # Two vectors swapped each round plus one n x n scratch, all allocated once
+            d_next, scratch = np.empty_like(d), np.empty_like(W_np)
+            for _ in range(n - 1):
+                _semiring_matvec(W_np, d, kernel, zero, out=d_next, scratch=scratch)
+                d, d_next = d_next, d
+            return [d.tolist()]
+        return _semiring_power(W_np, max(n, 1), kernel, zero).tolist()
+
     if source is not None:
         # Single-source shortest path
-        d = [semiring.zero] * n
-        d[source] = semiring.one
+        d = [zero] * n
+        d[source] = one
 
         for _ in range(n - 1):
-            d = extended(d, W, n, semiring, source=source)
+            d = _extend_generic(d, W, n, add, multiply, zero, source)
         return [d]  # Return as list of lists for consistency
     else:
-        # All-pairs shortest path
+        # All-pairs shortest path, on the linear schedule: repeated squaring
+        # regroups the products, which is only exact for associative operations.
+        # The known-associative SEMIRING_KERNELS semirings square via the kernel path
         L = [row[:] for row in W]
         for _ in range(n - 1):
-            L = extended(L, W, n, semiring)
+            L = _extend_generic(L, W, n, add, multiply, zero)
         return L
 
 
@@ -84,12 +235,11 @@ def extend_shortest_paths(L_prev: List[List[T]], W: List[List[T]], n: int, semir
     Returns:
         Updated distance matrix
     """
-    L_new = [[semiring.zero for _ in range(n)] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            for k in range(n):
-                L_new[i][j] = semiring.add(L_new[i][j], semiring.multiply(L_prev[i][k], W[k][j]))
-    return L_new
+    kernel = _semiring_kernel(semiring)
+    if kernel is not None:
+        return _semiring_matmul(_as_array(L_prev, n), _as_array(W, n), kernel, semiring.zero).tolist()
+
+    return _extend_generic(L_prev, W, n, semiring.add, semiring.multiply, semiring.zero)
 
 
 def slow_apsp(W: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
@@ -104,6 +254,10 @@ def slow_apsp(W: List[List[T]], n: int, semiring: Semiring) -> List[List[T]]:
     Returns:
         Distance matrix
     """
+    kernel = _semiring_kernel(semiring)
+    if kernel is not None:
+        return _semiring_power(_as_array(W, n), max(n, 1), kernel, semiring.zero).tolist()
+
     L = [row[:] for row in W]
     for r in range(1, n):
         L = extend_shortest_paths(L, W, n, semiring)
@@ -128,10 +282,15 @@ def generalized_mst(W: List[List[T]], n: int, semiring: Semiring) -> List[tuple]
     if n == 0:
         return []
     
+    add, zero = semiring.add, semiring.zero
+    if add is min and zero == math.inf and semiring.one < zero:
+        # min is a total order on the weights, so a heap can stand in for the scan
+        return _mst_heap(W, n, semiring.one)
+    
     # Track vertices in MST
     in_mst = [False] * n
     # Minimum edge weight to reach each vertex
-    min_edge = [semiring.zero] * n
+    min_edge = [zero] * n
     # Parent of each vertex in MST
     parent = [-1] * n
     # MST edges
@@ -140,12 +299,20 @@ def generalized_mst(W: List[List[T]], n: int, semiring: Semiring) -> List[tuple]
     # Start from vertex 0
     min_edge[0] = semiring.one
     
+    # Edge lists from one vectorized compare against zero, so the relax loop
+    # visits only real edges; weights NumPy cannot convert keep the full row scan
+    try:
+        has_edge = np.asarray(W, dtype=np.float64).reshape(len(W), len(W[0]) if len(W) else 0)[:n, :n] != zero
+        neighbors = [np.flatnonzero(row).tolist() for row in has_edge]
+    except (TypeError, ValueError):
+        neighbors = None
+    
     for _ in range(n):
         # Find vertex with minimum edge weight
         u = -1
         for v in range(n):
             if not in_mst[v]:
-                if u == -1 or semiring.add(min_edge[v], min_edge[u]) == min_edge[v]:
+                if u == -1 or add(min_edge[v], min_edge[u]) == min_edge[v]:
                     u = v
         
         # Add vertex to MST
@@ -156,12 +323,61 @@ def generalized_mst(W: List[List[T]], n: int, semiring: Semiring) -> List[tuple]
             mst_edges.append((parent[u], u, W[parent[u]][u]))
         
         # Update minimum edges to adjacent vertices
-        for v in range(n):
-            if not in_mst[v] and W[u][v] != semiring.zero:
+        W_u = W[u]
+        for v in (range(n) if neighbors is None else neighbors[u]):
+            w = W_u[v]
+            if not in_mst[v] and w != zero:
                 # Check if edge (u,v) gives better connection to v
-                if (min_edge[v] == semiring.zero or 
-                    semiring.add(W[u][v], min_edge[v]) == W[u][v]):
-                    min_edge[v] = W[u][v]
+                if min_edge[v] == zero or add(w, min_edge[v]) == w:
+                    min_edge[v] = w
                     parent[v] = u
     
     return mst_edges
+
+
+def _mst_heap(W, n: int, one) -> List[tuple]:
+    """
+    generalized_mst for add=min with zero=inf, in O(E log V) heap operations.
+    
+    The scan keeps the last vertex among equal minima and lets a later equal
+    edge take over as parent, so heap entries are (min_edge[v], -v) and ties
+    update the parent too. Semirings without a total order keep the scan.
+    """
+    W_np = _as_array(W, n)
+    in_mst = [False] * n
+    min_edge = [math.inf] * n
+    parent = [-1] * n
+    mst_edges = []
+    
+    min_edge[0] = one
+    heap = [(one, 0)]
+    next_root = n - 1
+    
+    for _ in range(n):
+        u = -1
+        while heap:
+            key, v = heapq.heappop(heap)
+            v = abs(v)
+            if not in_mst[v] and key == min_edge[v]:
+                u = v
+                break
+        if u == -1:
+            # Nothing reachable is left: the scan picks the highest unvisited index
+            while in_mst[next_root]:
+                next_root -= 1
+            u = next_root
+        
+        in_mst[u] = True
+        if parent[u] != -1:
+            mst_edges.append((parent[u], u, W[parent[u]][u]))
+        
+        W_u = W[u]
+        for v in np.flatnonzero(W_np[u] != math.inf).tolist():
+            w = W_u[v]
+            if not in_mst[v] and w <= min_edge[v]:
+                parent[v] = u
+                if w < min_edge[v]:
+                    min_edge[v] = w
+                    heapq.heappush(heap, (w, -v))
+    
+    return mst_edges
@@ -5,10 +5,44 @@ This module contains classic implementations of graph algorithms
 for comparison with the generalized semiring-based approaches.
 """
 
+import heapq
+import math
 from typing import List
 
+import numpy as np
+from scipy import sparse
 
-def floyd_warshall(adj_matrix: List[List[float]]) -> List[List[float]]:
+from src.algorithms._numba_kernels import bf_numba, fw_numba, fw_symmetric_numba
+
+
+def _neighbor_lists(mask: np.ndarray) -> List[List[int]]:
+    """Column indices of the True cells of each row of ``mask``."""
+    rows, cols = np.nonzero(mask)
+    bounds = np.searchsorted(rows, np.arange(mask.shape[0] + 1)).tolist()
+    cols = cols.tolist()
+    return [cols[bounds[i]:bounds[i + 1]] for i in range(mask.shape[0])]
+
+
+def _csr_rows(adj_matrix, keep) -> tuple:
+    """
+    Neighbor lists and per-row {neighbor: weight} dicts of a scipy sparse matrix.
+    
+    Only stored entries whose weight passes ``keep`` count as edges, so the
+    cost is O(E) instead of the O(V^2) scan of a dense row per vertex.
+    """
+    A = sparse.csr_matrix(adj_matrix, dtype=np.float64, copy=True)
+    A.sum_duplicates()  # Also sorts each row's indices, as np.nonzero would
+    n = A.shape[0]
+    rows = np.repeat(np.arange(n), np.diff(A.indptr))
+    edge = keep(A.data)
+    cols, data = A.indices[edge].tolist(), A.data[edge].tolist()
+    bounds = np.searchsorted(rows[edge], np.arange(n + 1)).tolist()
+    neighbors = [cols[bounds[i]:bounds[i + 1]] for i in range(n)]
+    weights = [dict(zip(cols[bounds[i]:bounds[i + 1]], data[bounds[i]:bounds[i + 1]])) for i in range(n)]
+    return neighbors, weights
+
+
+def floyd_warshall(adj_matrix: List[List[float]], symmetric: bool = False) -> List[List[float]]:
     """
     Traditional Floyd-Warshall algorithm for All-Pairs Shortest Path.
     
@@ -17,71 +51,76 @@ def floyd_warshall(adj_matrix: List[List[float]]) -> List[List[float]]:
     
     Args:
         adj_matrix: Adjacency matrix representation of the graph
+        symmetric: Caller guarantees an undirected graph; only the upper
+            triangle is relaxed and mirrored
         
     Returns:
         Distance matrix with shortest paths between all pairs
     """
     n = len(adj_matrix)
-    # Initialize distance matrix
-    dist = [[float('inf')] * n for _ in range(n)]
-    
-    # Copy the adjacency matrix
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                dist[i][j] = 0
-            elif adj_matrix[i][j] == 1:  # There's an edge
-                dist[i][j] = 1
+    A = np.asarray(adj_matrix, dtype=np.float64).reshape(n, n)
+    # Initialize distance matrix: unit weight on every edge, 0 on the diagonal
+    dist = np.where(A == 1, 1.0, np.inf)
+    np.fill_diagonal(dist, 0.0)
     
     # Floyd-Warshall main algorithm
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                if dist[i][k] + dist[k][j] < dist[i][j]:
-                    dist[i][j] = dist[i][k] + dist[k][j]
+    if symmetric and fw_symmetric_numba is not None:
+        fw_symmetric_numba(dist)
+    elif fw_numba is not None:
+        fw_numba(dist)
+    else:
+        # Each k step relaxes all (i, j) pairs at once; rows with no path to k
+        # cannot improve, so when few rows reach k only those are gathered and relaxed
+        # (the gather copy costs more than it saves once over n / 8 rows qualify)
+        for k in range(n):
+            rows = np.flatnonzero(dist[:, k] != np.inf)
+            if rows.size > n // 8:
+                np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+            else:
+                dist[rows] = np.minimum(dist[rows], dist[rows, k, None] + dist[None, k, :])
     
-    return dist
+    return dist.tolist()
 
 
 def dijkstra(adj_matrix: List[List[float]], source: int) -> List[float]:
     """
     Traditional Dijkstra algorithm for Single-Source Shortest Path.
     
-    Time Complexity: O(V^2) for dense graphs with simple implementation
-    Space Complexity: O(V)
+    Time Complexity: O((V + E) log V) with a binary heap, plus O(V^2) to
+        read the adjacency matrix
+    Space Complexity: O(V + E)
     
     Args:
-        adj_matrix: Adjacency matrix representation of the graph
+        adj_matrix: Adjacency matrix representation of the graph, dense or
+            scipy sparse (e.g. from load_mtx_as_csr)
         source: Source vertex
         
     Returns:
         Distance vector from source to all vertices
     """
-    n = len(adj_matrix)
-    distances = [float('inf')] * n
+    if sparse.issparse(adj_matrix):
+        n = adj_matrix.shape[0]
+        neighbors, _ = _csr_rows(adj_matrix, lambda w: w == 1)
+    else:
+        n = len(adj_matrix)
+        # Neighbor lists built once, so each vertex scans its edges instead of a full row
+        A = np.asarray(adj_matrix, dtype=np.float64).reshape(n, n)
+        neighbors = _neighbor_lists(A == 1)
+    distances = [math.inf] * n
     distances[source] = 0
-    visited = [False] * n
     
-    for _ in range(n):
-        # Find minimum distance vertex
-        min_dist = float('inf')
-        min_vertex = -1
-        for v in range(n):
-            if not visited[v] and distances[v] < min_dist:
-                min_dist = distances[v]
-                min_vertex = v
-        
-        if min_vertex == -1:
-            break
-            
-        visited[min_vertex] = True
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > distances[u]:
+            continue  # Stale entry: u was settled with a shorter distance
         
         # Update distances to neighbors
-        for neighbor in range(n):
-            if (not visited[neighbor] and 
-                adj_matrix[min_vertex][neighbor] == 1 and 
-                distances[min_vertex] + 1 < distances[neighbor]):
-                distances[neighbor] = distances[min_vertex] + 1
+        nd = d + 1
+        for v in neighbors[u]:
+            if nd < distances[v]:
+                distances[v] = nd
+                heapq.heappush(heap, (nd, v))
     
     return distances
 
@@ -101,17 +140,24 @@ def bellman_ford(adj_matrix: List[List[float]], source: int) -> List[float]:
         Distance vector from source to all vertices
     """
     n = len(adj_matrix)
-    distances = [float('inf')] * n
-    distances[source] = 0
+    A = np.asarray(adj_matrix, dtype=np.float64).reshape(n, n)
+    # Edge list built once: each pass costs O(E) instead of scanning all n^2 cells
+    us, vs = np.nonzero(A == 1)
+    if bf_numba is not None:
+        return bf_numba(n, us, vs, source).tolist()
+
+    distances = np.full(n, np.inf)
+    distances[source] = 0.0
     
-    # Relax edges repeatedly
+    # Relax every edge at once per pass; stop at the fixpoint
     for _ in range(n - 1):
-        for u in range(n):
-            for v in range(n):
-                if adj_matrix[u][v] == 1 and distances[u] + 1 < distances[v]:
-                    distances[v] = distances[u] + 1
+        relaxed = distances.copy()
+        np.minimum.at(relaxed, vs, distances[us] + 1.0)
+        if np.array_equal(relaxed, distances):
+            break
+        distances = relaxed
     
-    return distances
+    return distances.tolist()
 
 
 def widest_path_floyd(adj_matrix: List[List[float]]) -> List[List[float]]:
@@ -125,24 +171,26 @@ def widest_path_floyd(adj_matrix: List[List[float]]) -> List[List[float]]:
         Matrix with maximum capacities between all pairs
     """
     n = len(adj_matrix)
-    capacity = [[0.0] * n for _ in range(n)]
-    
-    # Initialize capacity matrix
+    # Initialize capacity matrix in one pass: unit capacity per edge, 0 otherwise
+    capacity = [[1.0 if a == 1 else 0.0 for a in row[:n]] for row in adj_matrix]
     for i in range(n):
-        for j in range(n):
-            if i == j:
-                capacity[i][j] = float('inf')  # Infinite capacity to self
-            elif adj_matrix[i][j] == 1:
-                capacity[i][j] = 1.0  # Edge capacity
+        capacity[i][i] = math.inf  # Infinite capacity to self
     
-    # Main widest path algorithm
+    # Main widest path algorithm. Row k and column k are fixed points of step k
+    # (the diagonal is inf), so capacity[k] and capacity[i][k] can be hoisted.
     for k in range(n):
+        cap_k = capacity[k]
         for i in range(n):
+            cap_i = capacity[i]
+            cik = cap_i[k]
+            if cik == 0.0:
+                continue  # min(0, x) never raises a capacity
             for j in range(n):
-                capacity[i][j] = max(
-                    capacity[i][j],
-                    min(capacity[i][k], capacity[k][j])
-                )
+                v = cap_k[j]
+                if cik < v:
+                    v = cik
+                if v > cap_i[j]:
+                    cap_i[j] = v
     
     return capacity
 
@@ -152,36 +200,47 @@ def kruskal_mst(adj_matrix: List[List[float]]) -> List[tuple]:
     Traditional Kruskal's algorithm for Minimum Spanning Tree.
     """
     n = len(adj_matrix)
-    edges = []
+    A = np.asarray(adj_matrix, dtype=np.float64).reshape(n, n)
     
-    # Extract edges from adjacency matrix
-    for i in range(n):
-        for j in range(i + 1, n):
-            if adj_matrix[i][j] != float('inf') and adj_matrix[i][j] > 0:
-                edges.append((i, j, adj_matrix[i][j]))
+    # Extract upper-triangle edges, row-major like the nested loop it replaces
+    iu, ju = np.triu_indices(n, k=1)
+    w = A[iu, ju]
+    keep = (w != math.inf) & (w > 0)
+    iu, ju, w = iu[keep], ju[keep], w[keep]
     
-    # Sort edges by weight
-    edges.sort(key=lambda x: x[2])
+    # Sort edges by weight; stable, so equal weights keep row-major order
+    order = np.argsort(w, kind='stable')
+    edges = zip(iu[order].tolist(), ju[order].tolist())
     
-    # Union-Find for cycle detection
+    # Union-Find for cycle detection, union by rank
     parent = list(range(n))
+    rank = [0] * n
     
     def find(x):
-        if parent[x] != x:
-            parent[x] = find(parent[x])
-        return parent[x]
+        # Iterative: no recursion limit on long chains
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression: point everything on the walk at the root
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
     
     def union(x, y):
         root_x, root_y = find(x), find(y)
-        if root_x != root_y:
-            parent[root_x] = root_y
-            return True
-        return False
+        if root_x == root_y:
+            return False
+        if rank[root_x] < rank[root_y]:
+            root_x, root_y = root_y, root_x
+        parent[root_y] = root_x
+        if rank[root_x] == rank[root_y]:
+            rank[root_x] += 1
+        return True
     
     mst_edges = []
-    for u, v, weight in edges:
+    for u, v in edges:
         if union(u, v):
-            mst_edges.append((u, v, weight))
+            mst_edges.append((u, v, adj_matrix[u][v]))
             if len(mst_edges) == n - 1:
                 break
     
@@ -191,25 +250,44 @@ def kruskal_mst(adj_matrix: List[List[float]]) -> List[tuple]:
 def prim_mst(adj_matrix: List[List[float]]) -> List[tuple]:
     """
     Traditional Prim's algorithm for Minimum Spanning Tree.
+    
+    ``adj_matrix`` may also be a scipy sparse matrix (e.g. from
+    load_mtx_as_csr), whose stored entries are the edges.
     """
-    n = len(adj_matrix)
+    n = adj_matrix.shape[0] if sparse.issparse(adj_matrix) else len(adj_matrix)
     if n == 0:
         return []
     
+    if sparse.issparse(adj_matrix):
+        # Rows become {neighbor: weight} dicts, indexed below exactly like dense rows
+        neighbors, adj_matrix = _csr_rows(adj_matrix, lambda w: w != math.inf)
+    else:
+        A = np.asarray(adj_matrix, dtype=np.float64).reshape(n, n)
+        neighbors = _neighbor_lists(A != math.inf)
     visited = [False] * n
-    min_edge = [float('inf')] * n
+    min_edge = [math.inf] * n
     parent = [-1] * n
     mst_edges = []
     
-    # Start from vertex 0
+    # Start from vertex 0. Heap entries are (min_edge[v], v): ties pop the
+    # lowest index first, the same vertex a linear argmin scan would pick
     min_edge[0] = 0
+    heap = [(0, 0)]
+    next_root = 0
     
     for _ in range(n):
         # Find minimum edge vertex
         u = -1
-        for v in range(n):
-            if not visited[v] and (u == -1 or min_edge[v] < min_edge[u]):
+        while heap:
+            key, v = heapq.heappop(heap)
+            if not visited[v] and key == min_edge[v]:
                 u = v
+                break
+        if u == -1:
+            # Nothing reachable is left: start the next tree at the lowest unvisited vertex
+            while visited[next_root]:
+                next_root += 1
+            u = next_root
         
         visited[u] = True
         
@@ -218,10 +296,12 @@ def prim_mst(adj_matrix: List[List[float]]) -> List[tuple]:
             mst_edges.append((parent[u], u, adj_matrix[parent[u]][u]))
         
         # Update adjacent vertices
-        for v in range(n):
-            if (not visited[v] and adj_matrix[u][v] != float('inf') and 
-                adj_matrix[u][v] < min_edge[v]):
-                min_edge[v] = adj_matrix[u][v]
+        row_u = adj_matrix[u]
+        for v in neighbors[u]:
+            w = row_u[v]
+            if not visited[v] and w < min_edge[v]:
+                min_edge[v] = w
                 parent[v] = u
+                heapq.heappush(heap, (w, v))
     
     return mst_edges
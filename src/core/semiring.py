@@ -5,6 +5,8 @@ This module defines the basic semiring structure and common semirings
 used in graph algorithms.
 """
 
+import operator
+from functools import lru_cache
 from typing import Callable, TypeVar
 
 T = TypeVar("T")
@@ -13,6 +15,8 @@ T = TypeVar("T")
 class Semiring:
     """Semiring structure for algebraic graph operations."""
     
+    __slots__ = ("add", "multiply", "zero", "one")
+    
     def __init__(self, add: Callable[[T, T], T], multiply: Callable[[T, T], T], zero: T, one: T):
         """
         Initialize a semiring.
@@ -30,19 +34,86 @@ class Semiring:
     
     def __str__(self):
         return f"Semiring(zero={self.zero}, one={self.one})"
+    
+    def compile_extend(self) -> Callable:
+        """
+        Return ``extend(L_prev, W, n, zero)``, the APSP extension specialized to this semiring.
+        
+        See _compile_extend; the function is shared by every semiring with the
+        same add and multiply.
+        """
+        return _compile_extend(self.add, self.multiply)
+
+
+def _or(x, y):
+    # `or`/`and` return an operand and work on any truthy value, whereas
+    # operator.or_/and_ are bitwise and reject float weights
+    return x or y
+
+
+def _and(x, y):
+    return x and y
+
+
+# Inline Python for known operations; anything else is called by name
+_OP_EXPRS = {
+    operator.add: "({a} + {b})",
+    operator.mul: "({a} * {b})",
+    min: "({b} if {b} < {a} else {a})",  # min(a, b) returns a unless b < a
+    max: "({b} if {b} > {a} else {a})",
+    _or: "({a} or {b})",
+    _and: "({a} and {b})",
+}
+
+# add=min/max as a conditional store instead of rewriting every cell
+_ADD_STMTS = {
+    min: "if v < L_new_i[j]: L_new_i[j] = v",
+    max: "if v > L_new_i[j]: L_new_i[j] = v",
+}
+
+_EXTEND_TEMPLATE = """
+def extend(L_prev, W, n, zero):
+    L_new = [[zero for _ in range(n)] for _ in range(n)]
+    for i in range(n):
+        L_prev_i, L_new_i = L_prev[i], L_new[i]
+        for k in range(n):
+            l_ik, W_k = L_prev_i[k], W[k]
+            for j in range(n):
+                v = {mul}
+                {add}
+    return L_new
+"""
+
+
+@lru_cache(maxsize=None)
+def _compile_extend(add: Callable, multiply: Callable) -> Callable:
+    """
+    Generate and exec the i-k-j extension loop with ``add``/``multiply`` inlined.
+    
+    Known operations become plain expressions, so the inner loop makes no
+    Python calls; every cell still accumulates over k = 0..n-1 from zero,
+    exactly like calling the operations.
+    """
+    mul = _OP_EXPRS.get(multiply, "mul({a}, {b})").format(a="l_ik", b="W_k[j]")
+    add_stmt = _ADD_STMTS.get(add)
+    if add_stmt is None:
+        add_stmt = "L_new_i[j] = " + _OP_EXPRS.get(add, "add({a}, {b})").format(a="L_new_i[j]", b="v")
+    namespace = {"add": add, "mul": multiply}
+    exec(_EXTEND_TEMPLATE.format(mul=mul, add=add_stmt), namespace)
+    return namespace["extend"]
 
 
 # Predefined semirings for common algorithms
 SHORTEST_PATH_SEMIRING = Semiring(
     add=min,
-    multiply=lambda x, y: x + y,
+    multiply=operator.add,
     zero=float('inf'),
     one=0
 )
 
 LONGEST_PATH_SEMIRING = Semiring(
     add=max,
-    multiply=lambda x, y: x + y,
+    multiply=operator.add,
     zero=float('-inf'),
     one=0
 )
@@ -55,15 +126,26 @@ WIDEST_PATH_SEMIRING = Semiring(
 )
 
 REACHABILITY_SEMIRING = Semiring(
-    add=lambda x, y: x or y,
-    multiply=lambda x, y: x and y,
+    add=_or,
+    multiply=_and,
     zero=False,
     one=True
 )
 
 PATH_COUNT_SEMIRING = Semiring(
-    add=lambda x, y: x + y,
-    multiply=lambda x, y: x * y,
+    add=operator.add,
+    multiply=operator.mul,
     zero=0,
     one=1
 )
+
+
+def make_shortest_path_semiring(big: float) -> Semiring:
+    """
+    (min, +) semiring whose "no edge" is the finite value ``big``.
+    
+    Pair it with matrices loaded with ``inf_value=big``: the products then
+    never add or compare an inf. With non-negative weights and ``big`` above
+    every real path length, any result >= big means no path.
+    """
+    return Semiring(add=min, multiply=operator.add, zero=big, one=0)
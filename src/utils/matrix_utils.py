@@ -5,11 +5,32 @@ This module provides utilities for loading Matrix Market files and
 converting between different matrix formats.
 """
 
+import hashlib
 import os
+from functools import lru_cache
 from typing import List
 import numpy as np
 from scipy import sparse
-from scipy.io import mmread, mmwrite
+from scipy.io import mminfo, mmread, mmwrite
+
+try:
+    import fast_matrix_market as fmm
+except ImportError:  # optional; scipy's mmread reads the same files
+    fmm = None
+
+
+def _mtx_has_stamp(filename: str, stamp: str) -> bool:
+    """True if the header comments of an existing .mtx file contain ``stamp``."""
+    try:
+        with open(filename, 'r') as f:
+            for line in f:
+                if not line.startswith('%'):
+                    return False
+                if stamp in line:
+                    return True
+    except OSError:
+        pass
+    return False
 
 
 def generate_random_mtx_file(
@@ -19,103 +40,306 @@ def generate_random_mtx_file(
     symmetric: bool = False,
     pattern: bool = True,
     dtype=np.float64,
+    seed=None,
+    min_weight: float = None,
+    max_weight: float = None,
 ) -> None:
-    """Generate a random Matrix Market file for testing."""
-    A = sparse.random(n, n, density=density, format='coo', dtype=dtype)
+    """
+    Generate a random Matrix Market file for testing.
+    
+    With a seed the output is deterministic, so a hash of the parameters is
+    written into the header comment and the call is skipped when ``filename``
+    already carries it. ``min_weight``/``max_weight`` draw non-pattern weights
+    uniformly from that range, mirrored for symmetric matrices.
+    """
+    stamp = None
+    if seed is not None:
+        params = (n, density, symmetric, pattern, np.dtype(dtype).str, seed, min_weight, max_weight)
+        stamp = f"params {hashlib.blake2b(repr(params).encode(), digest_size=8).hexdigest()}"
+        if _mtx_has_stamp(filename, stamp):
+            print(f"Reusing random matrix: {filename}")
+            return
+    
+    rng = np.random.default_rng(seed)
+    A = sparse.random(n, n, density=density, format='coo', dtype=dtype, random_state=rng)
 
     if symmetric:
-        A = A + A.T
+        A = (A + A.T).tocoo()
 
     if pattern:
         A.data[:] = 1  # Pattern matrix (boolean entries only)
+    elif min_weight is not None or max_weight is not None:
+        lo = 0.0 if min_weight is None else min_weight
+        hi = 1.0 if max_weight is None else max_weight
+        # One weight per unordered pair, so (i, j) and (j, i) stay equal
+        pair = np.minimum(A.row, A.col).astype(np.int64) * n + np.maximum(A.row, A.col)
+        uniq, inverse = np.unique(pair, return_inverse=True)
+        A.data = rng.uniform(lo, hi, size=uniq.size)[inverse].astype(dtype)
 
-    mmwrite(filename, A)
+    mmwrite(filename, A, comment=stamp or '')
     print(f"Generated random matrix: {filename}")
 
 
-def load_mtx_as_dense_list(path: str, inf_value: float = float("inf")) -> List[List[float]]:
-    """Load a Matrix Market file and convert to dense adjacency list format."""
+def generate_random_dense(
+    n: int,
+    density: float = 0.1,
+    symmetric: bool = False,
+    seed=None,
+    inf_value: float = float("inf"),
+    dtype=np.float64,
+) -> np.ndarray:
+    """
+    Generate a random unit-weight adjacency matrix in memory.
+    
+    Uses the same layout as load_mtx_as_dense_list (1.0 per edge, 0.0 on the
+    diagonal, inf_value elsewhere) but skips the Matrix Market round trip.
+    """
+    A = sparse.random(n, n, density=density, format='coo', random_state=seed)
+    dense = np.full((n, n), inf_value, dtype=dtype)
+    dense[A.row, A.col] = 1.0
+    if symmetric:
+        dense[A.col, A.row] = 1.0
+    np.fill_diagonal(dense, 0.0)
+    return dense
+
+
+def load_or_generate(
+    name: str,
+    n: int,
+    density: float = 0.1,
+    symmetric: bool = True,
+    seed=None,
+    cache_dir: str = "test_data",
+    dtype=np.float64,
+) -> np.ndarray:
+    """
+    Return a generate_random_dense matrix, cached as .npy in cache_dir.
+    
+    The file name carries a hash of the generation parameters, so a repeated
+    run loads the saved array with np.load instead of generating, writing and
+    re-parsing a .mtx file; changing any parameter produces a new entry.
+    """
+    key = hashlib.sha1(repr((n, density, symmetric, seed, np.dtype(dtype).str)).encode()).hexdigest()[:12]
+    path = os.path.join(cache_dir, f"{name}_{key}.npy")
+    if os.path.exists(path):
+        return np.load(path)
+    
+    dense = generate_random_dense(n, density, symmetric=symmetric, seed=seed, dtype=dtype)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write then rename: concurrent workers never see a half-written file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, dense)
+    os.replace(tmp, path)
+    return dense
+
+
+def _parse_mtx_manually(path: str, inf_value: float, symmetrize: bool = True) -> np.ndarray:
+    """Fallback parser for files that scipy's mmread rejects."""
+    with open(path, 'r') as f:
+        lines = f.readlines()
+    
+    # Skip comments
+    data_lines = [line.strip() for line in lines if not line.startswith('%')]
+    
+    # Parse header
+    header = data_lines[0].split()
+    n_rows, n_cols = int(header[0]), int(header[1])
+    n = max(n_rows, n_cols)
+    
+    # Parse edges (1-based in the file)
+    rows, cols = [], []
+    for line in data_lines[1:]:
+        if line:
+            parts = line.split()
+            i, j = int(parts[0]) - 1, int(parts[1]) - 1
+            if i < n and j < n:
+                rows.append(i)
+                cols.append(j)
+    
+    dense = np.full((n, n), inf_value)
+    dense[rows, cols] = 1.0
+    if symmetrize:
+        dense[cols, rows] = 1.0
+    np.fill_diagonal(dense, 0.0)
+    print(f"Manually parsed matrix: {n}x{n}")
+    return dense
+
+
+def _read_mtx_coords(path: str, symmetrize: bool = True):
+    """
+    Return ``(rows, cols, n)`` for the edges of a Matrix Market file.
+    
+    Both readers already expand symmetric, skew-symmetric and hermitian
+    storage to both triangles, so only "general" files are mirrored, and
+    only when ``symmetrize`` is set.
+    """
     try:
-        print(f"Loading matrix from {path}...")
-        
-        # Try to read with scipy first
-        try:
+        header = fmm.read_header(path) if fmm is not None else None
+        if header is not None and header.format == "coordinate":
+            # Multithreaded C++ parse straight into COO index arrays
+            (data, (rows, cols)), shape = fmm.read_coo(path)
+            symmetry = header.symmetry
+            print(f"Matrix loaded successfully: {shape}")
+            print("Matrix format: coo")
+            print(f"Matrix data type: {data.dtype}")
+        else:
             sparse_matrix = mmread(path)
             print(f"Matrix loaded successfully: {sparse_matrix.shape}")
             print(f"Matrix format: {sparse_matrix.format}")
             print(f"Matrix data type: {sparse_matrix.dtype}")
-        except Exception as scipy_error:
-            print(f"Scipy failed: {scipy_error}")
-            print("Attempting manual parsing...")
-            
-            # Manual parsing for problematic format
-            with open(path, 'r') as f:
-                lines = f.readlines()
-            
-            # Skip comments
-            data_lines = []
-            for line in lines:
-                if not line.startswith('%'):
-                    data_lines.append(line.strip())
-            
-            # Parse header
-            header = data_lines[0].split()
-            n_rows, n_cols = int(header[0]), int(header[1])
-            n = max(n_rows, n_cols)
-            
-            # Create the matrix manually
-            dense = [[inf_value] * n for _ in range(n)]
-            
-            # Parse edges
-            for line in data_lines[1:]:
-                if line:
-                    parts = line.split()
-                    i, j = int(parts[0]) - 1, int(parts[1]) - 1  # Convert to 0-based indexing
-                    if i < n and j < n:
-                        dense[i][j] = 1.0
-                        dense[j][i] = 1.0  # Symmetric
-            
-            # Set diagonal to 0
-            for i in range(n):
-                dense[i][i] = 0.0
-                
-            print(f"Manually parsed matrix: {n}x{n}")
-            return dense
-                
-    except Exception as e:
-        print(f"Error details: {str(e)}")
+            coo = sparse.coo_matrix(sparse_matrix)
+            rows, cols, shape = coo.row, coo.col, coo.shape
+            symmetry = mminfo(path)[5]
+    except Exception as scipy_error:
+        print(f"Scipy failed: {scipy_error}")
+        print("Attempting manual parsing...")
+        try:
+            dense = _parse_mtx_manually(path, float("inf"), symmetrize)
+        except Exception as e:
+            print(f"Error details: {str(e)}")
+            raise RuntimeError(f"Failed to read .mtx file: {e}")
+        rows, cols = np.nonzero(dense == 1.0)
+        return rows, cols, dense.shape[0]
+    if symmetrize and symmetry == "general":
+        rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+    return rows, cols, max(shape)
+
+
+def _read_mtx_dense(path: str, inf_value: float, symmetrize: bool = True) -> np.ndarray:
+    """Parse a Matrix Market file into the dense adjacency layout."""
+    rows, cols, n = _read_mtx_coords(path, symmetrize)
+    dense = np.full((n, n), inf_value)
+    dense[rows, cols] = 1.0
+    np.fill_diagonal(dense, 0.0)
+    return dense
+
+
+# Only matrices up to this many cells (8 MB as float64) are cached: the cache
+# is for cheap repeat loads of small files, not for pinning n^2 floats per file
+_CACHE_MAX_CELLS = 1 << 20
+
+
+@lru_cache(maxsize=4)
+def _load_mtx_cached(path: str, mtime_ns: int, size: int, inf_value: float, symmetrize: bool) -> np.ndarray:
+    # mtime_ns and size are only part of the key: rewriting the file invalidates the entry
+    dense = _read_mtx_dense(path, inf_value, symmetrize)
+    dense.setflags(write=False)  # Shared between callers; each gets its own copy
+    return dense
+
+
+def _load_mtx(path: str, inf_value: float, symmetrize: bool = True) -> np.ndarray:
+    path = os.path.abspath(path)
+    try:
+        shape = mminfo(path)[:2]  # Header only
+    except ValueError:  # Malformed header: leave it to the readers' manual fallback
+        shape = None
+    if shape is None or max(shape) ** 2 > _CACHE_MAX_CELLS:
+        return _read_mtx_dense(path, inf_value, symmetrize)
+    st = os.stat(path)
+    return _load_mtx_cached(path, st.st_mtime_ns, st.st_size, inf_value, symmetrize)
+
+
+def load_mtx_as_dense_list(path: str, inf_value: float = float("inf"), symmetrize: bool = True) -> List[List[float]]:
+    """
+    Load a Matrix Market file and convert to dense adjacency list format.
+    
+    The last few small parsed files are cached by path and modification
+    time, so loading the same unchanged file again skips mmread and returns
+    a fresh list.
+    Every edge is mirrored unless ``symmetrize=False``, which keeps "general"
+    (directed) files as stored; symmetric headers are expanded either way.
+    """
+    print(f"Loading matrix from {path}...")
+    try:
+        dense = _load_mtx(path, inf_value, symmetrize)
+    except OSError as e:
         raise RuntimeError(f"Failed to read .mtx file: {e}")
+    print(f"Converted to dense matrix: {dense.shape[0]}x{dense.shape[1]}")
+    return dense.tolist()
+
 
-    n = max(sparse_matrix.shape)
-    dense = [[inf_value] * n for _ in range(n)]
+def load_mtx_as_ndarray(
+    path: str,
+    inf_value: float = float("inf"),
+    dtype=np.float64,
+    symmetrize: bool = True,
+) -> np.ndarray:
+    """
+    Load a Matrix Market file as a dense adjacency array.
+    
+    Same layout and ``symmetrize`` option as load_mtx_as_dense_list (1.0
+    edges, 0.0 diagonal, inf_value elsewhere), filled with vectorized indexing into one contiguous
+    array instead of a Python float object per cell. Shares the list loader's
+    cache and returns a writable copy. Every cell is 0, 1 or inf_value, so
+    ``dtype=np.float32`` is exact and halves the memory the kernels stream.
+    """
+    try:
+        return _load_mtx(path, inf_value, symmetrize).astype(dtype)
+    except OSError as e:
+        raise RuntimeError(f"Failed to read .mtx file: {e}")
 
-    # Convert to COO format if needed
-    if hasattr(sparse_matrix, 'tocoo'):
-        sparse_matrix = sparse_matrix.tocoo()
-    else:
-        print(f"Warning: Matrix doesn't have tocoo method. Type: {type(sparse_matrix)}")
 
-    # Fill in the edges
+def load_mtx_as_csr(path: str, symmetrize: bool = True) -> sparse.csr_matrix:
+    """
+    Load a Matrix Market file as a CSR adjacency matrix.
+    
+    Same edges as load_mtx_as_ndarray (weight 1.0, mirrored unless
+    ``symmetrize=False``) but only the edges are stored: no diagonal and no
+    inf cells. dijkstra and prim_mst accept it directly and walk each row's
+    indices instead of a dense row.
+    """
     try:
-        for i, j in zip(sparse_matrix.row, sparse_matrix.col):
-            if i < n and j < n:  # Safety check
-                dense[i][j] = 1.0
-                if i != j:  # For symmetric graphs, add reverse edge unless it's a self-loop
-                    dense[j][i] = 1.0
-    except AttributeError as e:
-        print(f"Error accessing matrix data: {e}")
-        print(f"Matrix type: {type(sparse_matrix)}")
-        print(f"Matrix attributes: {dir(sparse_matrix)}")
-        raise
-
-    # Set diagonal to 0 (distance to self)
-    for i in range(n):
-        dense[i][i] = 0.0
-        
-    print(f"Converted to dense matrix: {n}x{n}")
+        rows, cols, n = _read_mtx_coords(path, symmetrize)
+    except OSError as e:
+        raise RuntimeError(f"Failed to read .mtx file: {e}")
+    off_diagonal = rows != cols
+    A = sparse.csr_matrix((np.ones(np.count_nonzero(off_diagonal)), (rows[off_diagonal], cols[off_diagonal])),
+                          shape=(n, n))
+    A.data[:] = 1.0  # Entries stored twice were summed
+    return A
+
+
+def load_corpus_matrix(
+    name: str,
+    corpus_path: str = os.path.join("test_data", "corpus.npz"),
+    inf_value: float = float("inf"),
+    dtype=np.float64,
+) -> np.ndarray:
+    """
+    Load one matrix from the archive written by tools/prepare_corpus.py.
+    
+    Same layout and ``dtype`` option as load_mtx_as_ndarray; the archive stores
+    each file's edge coordinates, so this is an np.load plus one fancy-index
+    write instead of parsing Matrix Market text.
+    """
+    with np.load(corpus_path) as corpus:
+        n = int(corpus[f"{name}/n"])
+        row, col = corpus[f"{name}/row"], corpus[f"{name}/col"]
+    dense = np.full((n, n), inf_value, dtype=dtype)
+    dense[row, col] = 1.0
+    np.fill_diagonal(dense, 0.0)
     return dense
 
 
+def allclose_with_inf(a, b, tolerance: float = 1e-6) -> bool:
+    """Elementwise |a - b| <= tolerance, with infinities required to match exactly."""
+    try:
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+    except ValueError:  # Ragged rows: not a matrix, so not a match
+        return False
+    if a.shape != b.shape:
+        return False
+    a_inf, b_inf = np.isinf(a), np.isinf(b)
+    if not (a_inf.any() or b_inf.any()):
+        # Fully connected results: one allclose pass, no masking
+        return bool(np.allclose(a, b, rtol=0.0, atol=tolerance))
+    if not (np.array_equal(a_inf, b_inf) and np.array_equal(a[a_inf], b[b_inf])):
+        return False
+    return bool(np.allclose(np.where(a_inf, 0.0, a), np.where(b_inf, 0.0, b), rtol=0.0, atol=tolerance))
+
+
 def find_mtx_files(directory: str = ".") -> List[str]:
     """Find all Matrix Market files in the specified directory."""
     pattern = os.path.join(directory, "*.mtx")
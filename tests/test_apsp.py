@@ -1,5 +1,8 @@
+import operator
 import unittest
+import numpy as np
 from algorithms_old.apsp import slow_apsp
+from algorithms_old.apsp_sssp import apsp_sssp
 from core.semiring import Semiring
 
 class TestAPSP(unittest.TestCase):
@@ -25,7 +28,47 @@ class TestAPSP(unittest.TestCase):
         ]
 
         result = slow_apsp(W, len(W), shortest_path_semiring)
-        self.assertEqual(result, expected_result)
+        np.testing.assert_array_equal(np.asarray(result), np.asarray(expected_result))
+
+        # Chains 0 -> 1 -> ... -> n-1 with edge i -> i+1 of weight i + 1
+        for n in (0, 1, 5, 16, 40):
+            with self.subTest(n=n):
+                W = [[0 if i == j else (i + 1 if j == i + 1 else inf) for j in range(n)] for i in range(n)]
+                expected_result = [[(j * (j + 1) - i * (i + 1)) // 2 if j >= i else inf for j in range(n)]
+                                   for i in range(n)]
+                result = slow_apsp(W, n, shortest_path_semiring)
+                np.testing.assert_array_equal(np.asarray(result), np.asarray(expected_result))
+
+    def test_apsp_min_plus_matches_generic(self):
+        inf = float('inf')
+        generic = Semiring(add=min, multiply=lambda x, y: x + y, zero=inf, one=0)
+        min_plus = Semiring(add=min, multiply=operator.add, zero=inf, one=0)
+
+        W = [
+            [0, 3, inf, 7],
+            [8, 0, 2, inf],
+            [5, inf, 0, 1],
+            [2, inf, inf, 0]
+        ]
+
+        self.assertEqual(slow_apsp(W, len(W), min_plus), slow_apsp(W, len(W), generic))
+
+
+    def test_apsp_cache_sees_in_place_edits(self):
+        inf = float('inf')
+        semiring = Semiring(add=min, multiply=operator.add, zero=inf, one=0)
+        W = [
+            [0, 3, inf],
+            [inf, 0, 1],
+            [inf, inf, 0]
+        ]
+
+        self.assertEqual(apsp_sssp(W, len(W), semiring), slow_apsp(W, len(W), semiring))
+        self.assertEqual(apsp_sssp(W, len(W), semiring, source=2), [4, 1, 0])
+
+        W[0][2] = 2
+        self.assertEqual(slow_apsp(W, len(W), semiring)[0], [0, 3, 2])
+        self.assertEqual(apsp_sssp(W, len(W), semiring, source=2), [2, 1, 0])
 
 if __name__ == "__main__":
     unittest.main()
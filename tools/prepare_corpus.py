@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Pack the Matrix Market test corpus into a single NumPy archive.
+
+Every test_data/*.mtx that loads is stored as its edge coordinates under
+"<name>/n", "<name>/row" and "<name>/col"; load_corpus_matrix rebuilds the
+dense adjacency array from them without re-parsing Matrix Market text.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import io
+import numpy as np
+from src import find_mtx_files, load_mtx_as_ndarray
+
+
+def prepare_corpus(directory: str = "test_data", output: str = None) -> str:
+    """Convert every loadable .mtx file in ``directory`` into one .npz archive."""
+    output = output or os.path.join(directory, "corpus.npz")
+    arrays = {}
+    for path in sorted(find_mtx_files(directory)):
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                dense = load_mtx_as_ndarray(path)
+        except Exception as e:
+            print(f"⚠️  Skipping {name}: {e}")
+            continue
+        
+        n = dense.shape[0]
+        # Edges are the 1.0 cells off the diagonal; the diagonal and inf are implied
+        edges = dense == 1.0
+        np.fill_diagonal(edges, False)
+        row, col = np.nonzero(edges)
+        arrays[f"{name}/n"] = np.int64(n)
+        arrays[f"{name}/row"] = row.astype(np.int32)
+        arrays[f"{name}/col"] = col.astype(np.int32)
+    
+    np.savez_compressed(output, **arrays)
+    print(f"Wrote {len(arrays) // 3} matrices to {output}")
+    return output
+
+
+if __name__ == "__main__":
+    prepare_corpus(*sys.argv[1:2])